@@ -1,57 +1,83 @@
 import pandas as pd
+import pyarrow.csv as pv
 import os
-from subprocess import Popen, PIPE
+import shutil
 from openpyxl import load_workbook
-from time import sleep
 import utils
 
 averageTemplatePath = r"D:\codes\RAWSim-OData\compare\averagesTemplate.xlsx"
 summaryTemplatePath = r"D:\codes\RAWSim-OData\compare\summaryTemplate.xlsx"
+# set WRITE_INTERMEDIATES=1 to also write the footprints and averages excel of every folder
+writeIntermediates = os.environ.get("WRITE_INTERMEDIATES", "0") == "1"
+# columns used for the averages
+columns = ["Instance", "Setting", "Controller","ItemThroughputRate", "DistanceTraveled", 
+           "TimingDecisionsOverall", "TimingPathPlanningOverall", "TimingTaskAllocationOverall", "TimingItemStorageOverall", 
+            "TimingPodStorageOverall", "TimingRepositioningOverall", "TimingReplenishmentBatchingOverall", 
+            "TimingOrderBatchingOverall", "TimingPodSelectionOverall", 
+             "OSIdleTimeAvg", "ItemPileOneAvg", "OrderPileOneAvg", "OrderLatenessAvg", "LateOrdersFractional", "DistanceTraveledPerBot"]
+
+# Shrink the dtypes of the footprints so that the groupby scans less memory
+def downcast(df):
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in ["Instance", "Setting", "Controller"]:
+        df[col] = df[col].astype('category')
+    return df
 
 files, folder = utils.askFiles("footprints.csv")
-summary = []
+# split the paths only once
+directories = [os.path.dirname(filepath) for filepath in files]
+names = [os.path.basename(directory) for directory in directories]
+footprints = []
 summaryPath = os.path.join(folder, f"summary_{os.path.basename(folder)}.xlsx")
-for filepath in files:
+for filepath, directory, name in zip(files, directories, names):
     print(f"processing: {filepath}")
-    directory, filename = os.path.split(filepath)
     #filepath = input('Enter the Folder: ').strip('"')
-    inputPath = os.path.abspath(filepath)
-    outputPath = os.path.join(directory, f"footprints_{os.path.basename(directory)}.xlsx")
-    averagePath = os.path.join(directory, f"averages_{os.path.basename(directory)}.xlsx")
     
-    # read footprints.csv
-    df = pd.read_csv(inputPath, delimiter=';')
-    df.to_excel(outputPath)
-
-    # calculate average of combination of instance and controller
-    columns = ["Instance", "Setting", "Controller","ItemThroughputRate", "DistanceTraveled", 
-               "TimingDecisionsOverall", "TimingPathPlanningOverall", "TimingTaskAllocationOverall", "TimingItemStorageOverall", 
-                "TimingPodStorageOverall", "TimingRepositioningOverall", "TimingReplenishmentBatchingOverall", 
-                "TimingOrderBatchingOverall", "TimingPodSelectionOverall", 
-                 "OSIdleTimeAvg", "ItemPileOneAvg", "OrderPileOneAvg", "OrderLatenessAvg", "LateOrdersFractional", "DistanceTraveledPerBot"]
-    result = df.loc[:, columns]
-    avg = result.groupby(["Instance", "Setting", "Controller"]).agg({key: ['mean', 'std'] for key in columns[3:]}).reset_index() 
-    # copy excel template
-    Popen(["copy", averageTemplatePath, averagePath], shell=True)
-    sleep(1)
-    writer = pd.ExcelWriter(averagePath, engine = 'openpyxl', mode='a', if_sheet_exists = "replace")
-    avg.to_excel(writer, sheet_name="Data")
-    writer.close()
-
-    # average result from all robots
-    avgs = avg.drop(columns = [col for col in avg.columns if col[1] == 'std'])
-    avgs.columns = [col[0] if isinstance(col, tuple) else col for col in avgs.columns] # flatten
-    avgs['Instance'] = avgs['Instance'].str.extract(r'(.+?)r\d+$')
-    avgs = avgs.groupby(["Instance", "Setting", "Controller"]).mean().reset_index() 
-    # put average in averages
-    summary.append(avgs)
+    # read footprints.csv, only parsing the needed columns unless all of them are written to excel
+    includeColumns = [] if writeIntermediates else columns
+    table = pv.read_csv(filepath, parse_options=pv.ParseOptions(delimiter=';'),
+                        convert_options=pv.ConvertOptions(include_columns=includeColumns))
+    if writeIntermediates:
+        outputPath = os.path.join(directory, f"footprints_{name}.xlsx")
+        # no template to keep here, so use the faster xlsxwriter engine
+        table.to_pandas().to_excel(outputPath, engine='xlsxwriter')
+    # only convert the needed columns for the averages, tagged with their folder
+    footprints.append(table.select(columns).to_pandas().assign(Folder=directory))
+
+# calculate average of combination of instance and controller for all folders at once
+result = downcast(pd.concat(footprints, ignore_index=True))
+result["Folder"] = pd.Categorical(result["Folder"], categories=directories) # keep the order of the files
+# strip the robot count once per distinct instance, so that the averages already carry the base instance
+codes, instances = pd.factorize(result['Instance'].cat.categories.str.rsplit('r', n=1).str[0], sort=True)
+result['InstanceBase'] = pd.Categorical.from_codes(codes[result['Instance'].cat.codes], categories=instances)
+# the std is only needed for the averages excel
+stats = ['mean', 'std'] if writeIntermediates else ['mean']
+avg = result.groupby(["Folder", "InstanceBase", "Instance", "Setting", "Controller"], observed=True, sort=False)[columns[3:]].agg(stats)
+if writeIntermediates:
+    avgFolders = avg.index.get_level_values("Folder")
+    for directory, name in zip(directories, names):
+        averagePath = os.path.join(directory, f"averages_{name}.xlsx")
+        # copy excel template
+        shutil.copyfile(averageTemplatePath, averagePath)
+        writer = pd.ExcelWriter(averagePath, engine = 'openpyxl', mode='a', if_sheet_exists = "replace")
+        if directory in avgFolders:
+            folderAvg = avg.loc[directory].droplevel("InstanceBase")
+        else: # header-only footprints.csv, write empty averages
+            folderAvg = avg.iloc[:0].droplevel(["Folder", "InstanceBase"])
+        folderAvg.reset_index().to_excel(writer, sheet_name="Data")
+        writer.close()
+
+# average result from all robots
+avgs = avg.xs('mean', axis=1, level=1) # only the means, with flat column labels
+avgs = avgs.groupby(level=["Folder", "InstanceBase", "Setting", "Controller"], observed=True, sort=False).mean().reset_index() 
+avgs = avgs.rename(columns = {"InstanceBase": "Instance"})
 
 print("creating summary")
-# Concatenate all average to summary
-summary_df = pd.concat(summary, ignore_index=True)
+# the averages of all folders form the summary, copied into one contiguous block per dtype for the write
+summary_df = avgs.drop(columns = "Folder").copy()
 # copy excel template
-Popen(["copy", summaryTemplatePath, summaryPath], shell=True)
-sleep(1)
+shutil.copyfile(summaryTemplatePath, summaryPath)
 writer = pd.ExcelWriter(summaryPath, engine = 'openpyxl', mode='a', if_sheet_exists = "replace")
 summary_df.to_excel(writer, sheet_name="Data")
 writer.close()
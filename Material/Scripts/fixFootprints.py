@@ -1,18 +1,31 @@
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
 import utils
 
 # Read the CSV file
 files, folder = utils.askFiles("footprints.csv")
 for file in files:
     print(f"fixing: {file}")
-    df = pd.read_csv(file, sep=';')
+    df = pd.read_csv(file, sep=';', engine='pyarrow', dtype_backend='pyarrow')
 
     # Check if the columns 'NBots' and 'Instance' exist in the dataframe
     if 'NBots' in df.columns and 'Instance' in df.columns:
         # Add the 'NBots' column values to the 'Instance' column values
-        df['Instance'] = df.apply(lambda row: f"{row['Instance']}r{row['NBots']}", axis=1)
+        df['Instance'] = df['Instance'].astype(str) + 'r' + df['NBots'].astype(str)
 
-        # Write the modified dataframe back to the CSV file
-        df.to_csv(file, index=False, sep=';')
+        # Write the modified dataframe back to the CSV file (unquoted, the footprint readers only split on the delimiter),
+        # going through a temporary file so that the original is only replaced once the write succeeded
+        tempFile = file + ".tmp"
+        try:
+            pv.write_csv(pa.Table.from_pandas(df, preserve_index=False), tempFile,
+                         write_options=pv.WriteOptions(delimiter=';', quoting_style='none', quoting_header='none'))
+        except pa.ArrowInvalid as e:
+            if os.path.exists(tempFile):
+                os.remove(tempFile)
+            print(f"Could not fix {file}, it is left unchanged: {e}")
+            continue
+        os.replace(tempFile, file)
     else:
         print("Columns 'NBots' and/or 'Instance' not found in the CSV file.")
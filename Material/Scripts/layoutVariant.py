@@ -1,6 +1,8 @@
 import xml.etree.ElementTree as ET
 import utils
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Function to create XML files with varying BotCount values
 def create_variant_files():
@@ -14,21 +16,34 @@ def create_variant_files():
         # Read the original XML file
         tree = ET.parse(filePath)
         root = tree.getroot()
+        # Find the elements to modify only once
+        bots = root.findall('BotCount')
+        nameLayouts = root.findall('NameLayout')
         
-        for bot_count in range(10, 110, 10):
-            # Modify the BotCount value
-            for bot in root.findall('BotCount'):
-                bot.text = str(bot_count)
-            # Modify the Name
-            for nameLayout in root.findall('NameLayout'):
-                nameLayout.text = str(f"{name}r{bot_count}")
+        lock = threading.Lock()
+
+        def write_variant(bot_count):
+            # The tree is shared, so modify and serialize it under the lock
+            with lock:
+                # Modify the BotCount value
+                for bot in bots:
+                    bot.text = str(bot_count)
+                # Modify the Name
+                for nameLayout in nameLayouts:
+                    nameLayout.text = str(f"{name}r{bot_count}")
+                data = ET.tostring(root, encoding='utf-8', xml_declaration=True)
             
             # Create a file with the name including the current BotCount
             new_file_name = f"{name}r{bot_count}{extension}"
             new_file_path = os.path.join(directory, new_file_name)
             
             # Write the modified XML data to the new file
-            tree.write(new_file_path, encoding='utf-8', xml_declaration=True)
+            with open(new_file_path, 'wb') as file:
+                file.write(data)
+
+        # Write the variants concurrently
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(write_variant, range(10, 110, 10)))
 
 # Call the function to create the files
 create_variant_files()
@@ -2,7 +2,8 @@ import subprocess
 from subprocess import Popen, DEVNULL
 from datetime import datetime, timedelta, timezone
 import random
-import time
+import threading
+import queue
 
 
 working_directory = "D:\codes\RAWSim-O\RAWSimO.CLI"
@@ -29,21 +30,23 @@ for i in range(Iteration):
         outputDir = experimentFolder
         cmds.append(["dotnet", "run", instPath, settPath, contPath, outputDir])
 
+# The seed of each run is offset from the start time by its index, so all seeds differ
+BaseSeed = int(datetime.now().replace(tzinfo=timezone(timedelta(hours=8))).strftime("%m%d%H%M%S"))
 NextURLNo = 0
 Processes = []
+Finished = queue.Queue() # Receives the return code of every process that exits
 
 def StartNew():
    """ Start a new subprocess if there is work to do """
    global NextURLNo
    global Processes
 
-   dateTime = datetime.now().replace(tzinfo=timezone(timedelta(hours=8))).strftime("%m%d%H%M%S")
-   seed = dateTime
-   cmds[NextURLNo].append(seed)
-   proc = Popen(cmds[NextURLNo], cwd=working_directory)
+   seed = str(BaseSeed + NextURLNo)
+   proc = Popen(cmds[NextURLNo] + [seed], cwd=working_directory)
    print ("Started to Process: ", FileNames[NextURLNo % (len(FileNames))])
    NextURLNo += 1
    Processes.append(proc)
+   threading.Thread(target=lambda: Finished.put(proc.wait()), daemon=True).start()
 
 def CheckRunning():
    """ Check any running processes and start new ones if there are spare slots."""
@@ -55,13 +58,12 @@ def CheckRunning():
          del Processes[p] # Remove from list - this is why we needed reverse order
 
    while (len(Processes) < ParalleledNum and NextURLNo < len(cmds)): # More to do and some spare slots
-      time.sleep(1)
       StartNew()
 
 if __name__ == "__main__":
    CheckRunning() # This will start the max processes running
    while (len(Processes) > 0): # Some thing still going on.
-      time.sleep(1) # You may wish to change the time for this
+      Finished.get() # Block until any process exits
       CheckRunning()
 
    print ("Done!")
\ No newline at end of file
@@ -1,9 +1,11 @@
 import subprocess
-from subprocess import Popen, DEVNULL
+from subprocess import DEVNULL
 from datetime import datetime, timedelta, timezone
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 import winsound
+from collections import Counter
 
 
 working_directory = "D:\codes\RAWSim-O\RAWSimO.CLI"
@@ -14,6 +16,8 @@ SettingFolder = "D:\codes\RAWSim-O\Material\configFiles"
 controllerFolder = "D:\codes\RAWSim-O\Material\configFiles"
 Iteration = 1
 ParalleledNum = 8
+# Number of runs of each controller per instance and setting
+Controllers = {"HADODn": 1, "SEQUn": 3, "SAIn": 3}
 # Add all combinations
 FileNames = []
 
@@ -21,7 +25,8 @@ for instance in ["S"]:
    for version in range(5, 6, 1):
       for botNum in range(10, 110, 10):
          for setting in ["JOSi1000o500"]:
-            for controller in ["HADODn", "SEQUn", "SAIn", "SEQUn", "SAIn", "SEQUn", "SAIn"]:
+            for controller, runs in Controllers.items():
+               for run in range(runs):
                   FileNames.append((f'{instance}v{version}r{botNum}', setting, controller))
 
 
@@ -45,40 +50,21 @@ for i in range(Iteration):
         outputDir = "{}\{}".format(experimentFolder, instance.rsplit('r', 1)[0])
         cmds.append(["dotnet", "run", instPath, settPath, contPath, outputDir])
 
-NextURLNo = 0
-Processes = []
+# The seed of each run is offset from the start time by its index, so all seeds differ
+BaseSeed = int(datetime.now().replace(tzinfo=timezone(timedelta(hours=8))).strftime("%m%d%H%M%S"))
 
-def StartNew():
-   """ Start a new subprocess if there is work to do """
-   global NextURLNo
-   global Processes
-
-   dateTime = datetime.now().replace(tzinfo=timezone(timedelta(hours=8))).strftime("%m%d%H%M%S")
-   seed = dateTime
-   cmds[NextURLNo].append(seed)
-   proc = Popen(cmds[NextURLNo], cwd=working_directory, stdout=DEVNULL)
-   print (f"({NextURLNo+1}/{len(cmds)}) Started to Process: ", FileNames[NextURLNo % (len(FileNames))])
-   NextURLNo += 1
-   Processes.append(proc)
-
-def CheckRunning():
-   """ Check any running processes and start new ones if there are spare slots."""
-   global Processes
-   global NextURLNo
-
-   for p in range(-len(Processes),0): # Check the processes in reverse order
-      if Processes[p].poll() is not None: # If the process hasn't finished will return None
-         del Processes[p] # Remove from list - this is why we needed reverse order
-
-   while (len(Processes) < ParalleledNum and NextURLNo < len(cmds)): # More to do and some spare slots
-      time.sleep(1)
-      StartNew()
+def RunExperiment(index):
+   """ Run one experiment and wait for it to finish """
+   seed = str(BaseSeed + index)
+   print (f"({index+1}/{len(cmds)}) Started to Process: ", FileNames[index % (len(FileNames))])
+   subprocess.run(cmds[index] + [seed], cwd=working_directory, stdout=DEVNULL)
 
 if __name__ == "__main__":
-   CheckRunning() # This will start the max processes running
-   while (len(Processes) > 0): # Some thing still going on.
-      time.sleep(60) # You may wish to change the time for this
-      CheckRunning()
+   for combination, runs in Counter(FileNames).items():
+      print (f"Planned {runs * Iteration} run(s) of: ", combination)
+   # The pool starts a new experiment as soon as a running one finishes
+   with ThreadPoolExecutor(ParalleledNum) as executor:
+      list(executor.map(RunExperiment, range(len(cmds))))
 
    winsound.Beep(261, 500)
    time.sleep(0.2)